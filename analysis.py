@@ -11,6 +11,8 @@ class MarketAnalyzer:
         self.w3 = w3_provider
         self.scaler = StandardScaler()
         self.logger = logging.getLogger(__name__)
+        self.analysis_weights = TRADING_CONFIG['analysis_weights']
+        self._weight_sum = sum(self.analysis_weights.values())
 
     async def analyze_token_metrics(self, token_address, pair_address):
         """Analyze token metrics for trading decisions."""
@@ -114,7 +116,7 @@ class MarketAnalyzer:
     def _calculate_composite_score(self, metrics):
         """Calculate overall trading score based on all metrics."""
         try:
-            weights = TRADING_CONFIG['analysis_weights']
+            weights = self.analysis_weights
             scores = []
             
             for category, category_metrics in metrics.items():
@@ -123,7 +125,7 @@ class MarketAnalyzer:
                     scores.append(category_score * weights.get(category, 1))
             
             if scores:
-                return sum(scores) / sum(weights.values())
+                return sum(scores) / self._weight_sum
             return 0
         except Exception as e:
             self.logger.error(f"Error calculating composite score: {e}")
@@ -1,10 +1,20 @@
 from web3 import Web3
 import json
 import aiohttp
+import orjson
 import logging
 from config import SAFETY_CONFIG, API_KEYS
 import asyncio
 
+# Percentage weight of each analysis section in the contract safety score
+SAFETY_SCORE_WEIGHTS = (
+    ('verification', 20),
+    ('code_analysis', 25),
+    ('ownership', 20),
+    ('functions', 20),
+    ('security', 15),
+)
+
 class ContractAnalyzer:
     def __init__(self, w3_provider):
         self.w3 = w3_provider
@@ -42,8 +52,9 @@ class ContractAnalyzer:
     async def _get_contract_data(self, token_address):
         """Fetch contract data from blockchain explorer."""
         try:
-            if token_address in self.contract_cache:
-                return self.contract_cache[token_address]
+            cache_key = token_address.lower()
+            if cache_key in self.contract_cache:
+                return self.contract_cache[cache_key]
 
             async with aiohttp.ClientSession() as session:
                 params = {
@@ -51,9 +62,9 @@ class ContractAnalyzer:
                     'apikey': API_KEYS['bscscan_api_key']
                 }
                 async with session.get('https://api.bscscan.com/api', params=params) as response:
-                    data = await response.json()
+                    data = orjson.loads(await response.read())
                     if data['status'] == '1':
-                        self.contract_cache[token_address] = data['result']
+                        self.contract_cache[cache_key] = data['result']
                         return data['result']
             return None
         except Exception as e:
@@ -63,14 +74,15 @@ class ContractAnalyzer:
     async def _check_verification(self, token_address):
         """Check if contract is verified."""
         try:
-            if token_address in self.verified_contracts:
+            cache_key = token_address.lower()
+            if cache_key in self.verified_contracts:
                 return True
 
             contract_data = await self._get_contract_data(token_address)
             is_verified = contract_data is not None and 'SourceCode' in contract_data
             
             if is_verified:
-                self.verified_contracts.add(token_address)
+                self.verified_contracts.add(cache_key)
             
             return is_verified
         except Exception as e:
@@ -208,14 +220,6 @@ class ContractAnalyzer:
     def _calculate_safety_score(self, analysis):
         """Calculate overall contract safety score."""
         try:
-            weights = {
-                'verification': 20,
-                'code_analysis': 25,
-                'ownership': 20,
-                'functions': 20,
-                'security': 15
-            }
-
             scores = {
                 'verification': 100 if analysis['verification'] else 0,
                 'code_analysis': analysis['code_analysis']['score'],
@@ -224,7 +228,7 @@ class ContractAnalyzer:
                 'security': analysis['security']['score']
             }
 
-            weighted_score = sum(scores[k] * weights[k] / 100 for k in weights)
+            weighted_score = sum(scores[k] * weight for k, weight in SAFETY_SCORE_WEIGHTS) / 100
             return round(weighted_score, 2)
         except Exception as e:
             self.logger.error(f"Error calculating safety score: {e}")
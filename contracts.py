@@ -0,0 +1,15 @@
+import os
+import json
+
+# Multicall3 is deployed at the same address on every EVM chain
+MULTICALL3_ADDRESS = '0xcA11bde05977b3631167028862bE2a173976CA11'
+
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'abi', 'multicall3.json'), 'r') as f:
+    MULTICALL3_ABI = json.load(f)
+
+# ERC20 selectors: symbol(), name(), decimals(), balanceOf(address), allowance(address,address)
+SYMBOL_SEL = bytes.fromhex('95d89b41')
+NAME_SEL = bytes.fromhex('06fdde03')
+DECIMALS_SEL = bytes.fromhex('313ce567')
+BALANCE_OF_SEL = bytes.fromhex('70a08231')
+ALLOWANCE_SEL = bytes.fromhex('dd62ed3e')
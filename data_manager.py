@@ -7,6 +7,7 @@ import json
 import os
 from config import DATA_CONFIG
 import aiohttp
+import orjson
 import asyncio
 from decimal import Decimal
 
@@ -334,7 +335,7 @@ class DataManager:
             async with aiohttp.ClientSession() as session:
                 async with session.get(url, headers=headers, params=query_params) as response:
                     if response.status == 200:
-                        return await response.json()
+                        return orjson.loads(await response.read())
                     else:
                         raise Exception(f"API request failed with status {response.status}")
         except Exception as e:
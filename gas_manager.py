@@ -12,6 +12,8 @@ class GasManager:
         self.gas_price_history = []
         self.last_update = 0
         self.update_interval = 15  # Update every 15 seconds
+        self.gas_limit = TRADING_CONFIG['gas_limit']
+        self.max_gas_price = TRADING_CONFIG['max_gas_price']
 
     async def get_optimal_gas(self, transaction_type='swap'):
         """Get optimal gas price and limit based on network conditions."""
@@ -45,8 +47,7 @@ class GasManager:
             optimal_gas_price = int(base_fee * buffer_multiplier) + priority_fee
             
             # Ensure within configured limits
-            max_gas_price = TRADING_CONFIG['max_gas_price']
-            return min(optimal_gas_price, max_gas_price)
+            return min(optimal_gas_price, self.max_gas_price)
         except Exception as e:
             self.logger.error(f"Error calculating optimal gas price: {e}")
             return self.w3.eth.gas_price
@@ -67,10 +68,10 @@ class GasManager:
             congestion_multiplier = await self._get_network_congestion_multiplier()
             estimated_limit = int(base_limit * congestion_multiplier)
             
-            return min(estimated_limit, TRADING_CONFIG['gas_limit'])
+            return min(estimated_limit, self.gas_limit)
         except Exception as e:
             self.logger.error(f"Error estimating gas limit: {e}")
-            return TRADING_CONFIG['gas_limit']
+            return self.gas_limit
 
     async def _update_gas_price_history(self):
         """Update gas price history if needed."""
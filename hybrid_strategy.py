@@ -1,10 +1,13 @@
 from web3 import Web3
 import asyncio
+import bisect
 import logging
 from config import TRADING_CONFIG, PROFIT_CONFIG
-import numpy as np
 from datetime import datetime
 
+# Opportunity score weights for market conditions, technical indicators, momentum and safety, in that order
+OPPORTUNITY_WEIGHTS = (0.3, 0.25, 0.25, 0.2)
+
 class HybridStrategy:
     def __init__(self, w3_provider, trader, analyzer, gas_manager):
         self.w3 = w3_provider
@@ -14,6 +17,10 @@ class HybridStrategy:
         self.logger = logging.getLogger(__name__)
         self.active_trades = {}
         self.trade_history = []
+        # Ascending safety thresholds and their position size multipliers, for bisect lookups
+        safety_multipliers = sorted(TRADING_CONFIG['position_sizing']['safety_multipliers'].items())
+        self._safety_thresholds = tuple(k for k, _ in safety_multipliers)
+        self._safety_mults = tuple(v for _, v in safety_multipliers)
 
     async def evaluate_trade_opportunity(self, token_address, pair_address):
         """Evaluate trading opportunity using hybrid analysis."""
@@ -171,21 +178,11 @@ class HybridStrategy:
                                   momentum_signals, safety_metrics):
         """Calculate overall opportunity score."""
         try:
-            weights = {
-                'market_conditions': 0.3,
-                'technical_indicators': 0.25,
-                'momentum_signals': 0.25,
-                'safety_metrics': 0.2
-            }
-            
-            scores = {
-                'market_conditions': self._aggregate_metrics(market_conditions),
-                'technical_indicators': self._aggregate_metrics(technical_indicators),
-                'momentum_signals': self._aggregate_metrics(momentum_signals),
-                'safety_metrics': self._aggregate_metrics(safety_metrics)
-            }
-            
-            weighted_score = sum(scores[k] * weights[k] for k in weights)
+            categories = (market_conditions, technical_indicators, momentum_signals, safety_metrics)
+            weighted_score = sum(
+                self._aggregate_metrics(metrics) * weight
+                for metrics, weight in zip(categories, OPPORTUNITY_WEIGHTS)
+            )
             return round(weighted_score * 100, 2)
         except Exception as e:
             self.logger.error(f"Error calculating opportunity score: {e}")
@@ -222,9 +219,8 @@ class HybridStrategy:
             base_size = TRADING_CONFIG['position_sizing']['base_size']
             
             # Get safety multiplier
-            safety_multipliers = TRADING_CONFIG['position_sizing']['safety_multipliers']
-            safety_mult = next((v for k, v in sorted(safety_multipliers.items(), reverse=True)
-                              if safety_score >= k), safety_multipliers[0])
+            index = bisect.bisect_right(self._safety_thresholds, safety_score) - 1
+            safety_mult = self._safety_mults[max(index, 0)]
             
             # Adjust for opportunity quality
             opportunity_mult = min(opportunity_score / 100, 1)
@@ -310,4 +306,5 @@ class HybridStrategy:
         """Aggregate metrics into a single score."""
         if not metrics:
             return 0
-        return np.mean(list(metrics.values()))
+        # Unweighted mean of the metric values
+        return sum(metrics.values()) / len(metrics)
@@ -2,9 +2,11 @@ import logging
 from typing import Dict, List, Optional, Union
 from decimal import Decimal
 import asyncio
+import time
 from datetime import datetime, timedelta
 from web3 import Web3
 import aiohttp
+import orjson
 import json
 from config import NETWORK_CONFIG
 
@@ -18,6 +20,9 @@ class NetworkManager:
         self.pending_transactions = {}
         self.manual_mode = True
         self.custom_gas_settings = {}
+        self._session = None
+        self._ttl_cache = {}
+        self._inflight = {}
         self._load_network_config()
 
     def _load_network_config(self):
@@ -41,6 +46,12 @@ class NetworkManager:
         except Exception as e:
             self.logger.error(f"Error loading RPC endpoints: {e}")
 
+    async def close(self):
+        """Close the shared HTTP session."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
     async def add_rpc_endpoint(self, network: str, url: str, chain_id: int):
         """Add custom RPC endpoint."""
         try:
@@ -221,25 +232,62 @@ class NetworkManager:
             self.logger.error(f"Error optimizing transaction: {e}")
             return None
 
+    def _get_session(self):
+        """Get the shared keep-alive HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=50, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._session
+
+    async def _cached(self, key, ttl: float, fetch):
+        """Return a cached result for key, calling fetch() when it is stale."""
+        now = time.monotonic()
+        entry = self._ttl_cache.get(key)
+        if entry and now - entry[0] < ttl:
+            return entry[1]
+
+        # Concurrent callers share the fetch already in flight for this key
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_cache(key, fetch))
+            # Retrieve the outcome even if every caller was cancelled, so errors are not left unobserved
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        # Shielded so a cancelled caller does not cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    async def _fetch_and_cache(self, key, fetch):
+        """Run fetch() for key, caching a truthy result."""
+        try:
+            result = await fetch()
+        finally:
+            self._inflight.pop(key, None)
+
+        if result:
+            self._ttl_cache[key] = (time.monotonic(), result)
+        return result
+
     async def _validate_rpc(self, url: str, chain_id: int):
         """Validate RPC endpoint connection and chain ID."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json={
-                    "jsonrpc": "2.0",
-                    "method": "eth_chainId",
-                    "params": [],
-                    "id": 1
-                }) as response:
-                    if response.status != 200:
-                        return False
-                    
-                    data = await response.json()
-                    if 'result' not in data:
-                        return False
-                    
-                    rpc_chain_id = int(data['result'], 16)
-                    return rpc_chain_id == chain_id
+            session = self._get_session()
+            async with session.post(url, json={
+                "jsonrpc": "2.0",
+                "method": "eth_chainId",
+                "params": [],
+                "id": 1
+            }) as response:
+                if response.status != 200:
+                    return False
+                
+                data = orjson.loads(await response.read())
+                if 'result' not in data:
+                    return False
+                
+                rpc_chain_id = int(data['result'], 16)
+                return rpc_chain_id == chain_id
         except Exception as e:
             self.logger.error(f"Error validating RPC: {e}")
             return False
@@ -276,17 +324,25 @@ class NetworkManager:
 
     async def _get_gas_oracle_prices(self):
         """Get gas prices from external oracle."""
+        return await self._cached(
+            ('gas_oracle', NETWORK_CONFIG['gas_oracle_url']),
+            15,
+            self._fetch_gas_oracle_prices
+        )
+
+    async def _fetch_gas_oracle_prices(self):
+        """Fetch gas prices from external oracle."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(NETWORK_CONFIG['gas_oracle_url']) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return {
-                            'low': data['safeLow'],
-                            'medium': data['standard'],
-                            'high': data['fast']
-                        }
-                    return {}
+            session = self._get_session()
+            async with session.get(NETWORK_CONFIG['gas_oracle_url']) as response:
+                if response.status == 200:
+                    data = orjson.loads(await response.read())
+                    return {
+                        'low': data['safeLow'],
+                        'medium': data['standard'],
+                        'high': data['fast']
+                    }
+                return {}
         except Exception as e:
             self.logger.error(f"Error getting oracle gas prices: {e}")
             return {}
@@ -320,19 +376,19 @@ class NetworkManager:
         try:
             start_time = datetime.now()
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json={
-                    "jsonrpc": "2.0",
-                    "method": "net_version",
-                    "params": [],
-                    "id": 1
-                }) as response:
-                    latency = (datetime.now() - start_time).total_seconds() * 1000
-                    
-                    return {
-                        'status': 'connected' if response.status == 200 else 'error',
-                        'latency_ms': latency
-                    }
+            session = self._get_session()
+            async with session.post(url, json={
+                "jsonrpc": "2.0",
+                "method": "net_version",
+                "params": [],
+                "id": 1
+            }) as response:
+                latency = (datetime.now() - start_time).total_seconds() * 1000
+                
+                return {
+                    'status': 'connected' if response.status == 200 else 'error',
+                    'latency_ms': latency
+                }
         except Exception as e:
             self.logger.error(f"Error checking connection: {e}")
             return {'status': 'error', 'latency_ms': None}
@@ -4,8 +4,13 @@ from datetime import datetime, timedelta
 import asyncio
 from decimal import Decimal
 from config import ORDER_CONFIG
+from contracts import ALLOWANCE_SEL
+from eth_abi import encode
 import json
 
+# Order states that end monitoring and move the order to history
+_FINAL_ORDER_STATES = frozenset({'completed', 'failed'})
+
 class OrderManager:
     def __init__(self, w3_provider, wallet_manager, router_address):
         self.w3 = w3_provider
@@ -205,27 +210,27 @@ class OrderManager:
             # Get deadline
             deadline = int(datetime.now().timestamp() + ORDER_CONFIG['transaction_deadline'])
             
-            # Prepare swap data
-            swap_data = self.router_contract.functions.swapExactETHForTokens(
+            # Encode only the calldata; building a full transaction would run eth_estimateGas
+            swap_data = self.router_contract.encodeABI(fn_name='swapExactETHForTokens', args=[
                 order['min_out'],
                 path,
                 order['wallet_address'],
                 deadline
-            )
+            ])
             
             # Get transaction parameters
             tx_params = {
                 'from': order['wallet_address'],
                 'value': order['amount'],
-                'gas': 0,  # Will be estimated
+                'gas': 0,  # Filled from the gas table below
                 'gasPrice': await self.wallet_manager._get_optimal_gas_price()
             }
             
             # Add swap data
-            tx_params['data'] = swap_data.build_transaction()['data']
+            tx_params['data'] = swap_data
             
-            # Estimate gas
-            tx_params['gas'] = await self.wallet_manager._estimate_gas(tx_params)
+            # Gas limit from the table for known swaps
+            tx_params['gas'] = await self.wallet_manager._estimate_gas(tx_params, 'swapExactETHForTokens')
             
             return tx_params
         except Exception as e:
@@ -241,28 +246,29 @@ class OrderManager:
             # Get deadline
             deadline = int(datetime.now().timestamp() + ORDER_CONFIG['transaction_deadline'])
             
-            # Prepare swap data
-            swap_data = self.router_contract.functions.swapExactTokensForETH(
+            # Encode only the calldata; building a full transaction would run eth_estimateGas,
+            # which reverts for a sell whose approval is sent in the same batch
+            swap_data = self.router_contract.encodeABI(fn_name='swapExactTokensForETH', args=[
                 order['amount'],
                 order['min_out'],
                 path,
                 order['wallet_address'],
                 deadline
-            )
+            ])
             
             # Get transaction parameters
             tx_params = {
                 'from': order['wallet_address'],
                 'value': 0,
-                'gas': 0,  # Will be estimated
+                'gas': 0,  # Filled from the gas table below
                 'gasPrice': await self.wallet_manager._get_optimal_gas_price()
             }
             
             # Add swap data
-            tx_params['data'] = swap_data.build_transaction()['data']
+            tx_params['data'] = swap_data
             
-            # Estimate gas
-            tx_params['gas'] = await self.wallet_manager._estimate_gas(tx_params)
+            # Gas limit from the table for known swaps
+            tx_params['gas'] = await self.wallet_manager._estimate_gas(tx_params, 'swapExactTokensForETH')
             
             return tx_params
         except Exception as e:
@@ -272,6 +278,24 @@ class OrderManager:
     async def _execute_order(self, order):
         """Execute prepared order transaction."""
         try:
+            # Sign a pending approval and the swap together, so both nonces are taken
+            # only once both transactions are built and are given back if either fails
+            approval = order.pop('approval', None)
+            if approval:
+                signed_txs = await self.wallet_manager.sign_transactions(
+                    [approval, order['transaction']],
+                    order['wallet_address']
+                )
+                if not signed_txs:
+                    return None
+                
+                # Send them together in one request
+                order['approval_tx_hash'], tx_hash = await self.wallet_manager.send_batch(
+                    signed_txs,
+                    order['wallet_address']
+                )
+                return tx_hash
+            
             # Sign transaction
             signed_tx = await self.wallet_manager.sign_transaction(
                 order['transaction'],
@@ -282,7 +306,10 @@ class OrderManager:
                 return None
             
             # Send transaction
-            tx_hash = await self.wallet_manager.send_transaction(signed_tx)
+            tx_hash = await self.wallet_manager.send_transaction(
+                signed_tx,
+                order['wallet_address']
+            )
             return tx_hash
         except Exception as e:
             self.logger.error(f"Error executing order: {e}")
@@ -303,7 +330,7 @@ class OrderManager:
                 order['receipt'] = receipt
                 
                 # Move to history if finished
-                if order['status'] in ['completed', 'failed']:
+                if order['status'] in _FINAL_ORDER_STATES:
                     self.order_history[order_id] = order
                     del self.orders[order_id]
                     self.pending_orders.discard(order_id)
@@ -313,31 +340,24 @@ class OrderManager:
     async def _check_token_approval(self, order):
         """Check and handle token approval if needed."""
         try:
-            # Get current allowance
-            token_contract = self.w3.eth.contract(
-                address=order['token_address'],
-                abi=self._get_erc20_abi()
-            )
-            
-            allowance = await token_contract.functions.allowance(
-                order['wallet_address'],
-                self.router_address
-            ).call()
+            # Get current allowance with hand-built allowance(owner, spender) calldata
+            result = await self.w3.eth.call({
+                'to': order['token_address'],
+                'data': ALLOWANCE_SEL + encode(
+                    ['address', 'address'],
+                    [order['wallet_address'], self.router_address]
+                )
+            })
+            allowance = int.from_bytes(result, 'big')
             
             if allowance < order['amount']:
-                # Approve token spending
-                tx_hash = await self.wallet_manager.approve_token(
+                # Build the approval now; it is signed and sent with the swap in one batch
+                order['approval'] = await self.wallet_manager.prepare_approval(
                     order['token_address'],
                     self.router_address,
                     order['wallet_address']
                 )
-                
-                if not tx_hash:
-                    return False
-                
-                # Wait for approval confirmation
-                receipt = await self.wallet_manager.monitor_transaction(tx_hash)
-                return receipt and receipt['status']
+                return order['approval'] is not None
             
             return True
         except Exception as e:
@@ -363,12 +383,3 @@ class OrderManager:
         """Get current token price from pair."""
         # Implement price fetching
         pass
-
-    def _get_erc20_abi(self):
-        """Get standard ERC20 ABI."""
-        try:
-            with open(ORDER_CONFIG['erc20_abi_path'], 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            self.logger.error(f"Error loading ERC20 ABI: {e}")
-            return None
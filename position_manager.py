@@ -2,6 +2,7 @@ from web3 import Web3
 import logging
 from datetime import datetime, timedelta
 import asyncio
+import time
 from decimal import Decimal
 from config import POSITION_CONFIG
 import numpy as np
@@ -33,6 +34,7 @@ class PositionManager:
                 entry_price = await self._get_current_price(pair_address)
             
             # Create position object
+            now = time.time()
             position = {
                 'id': position_id,
                 'token_address': token_address,
@@ -41,8 +43,9 @@ class PositionManager:
                 'amount': amount,
                 'entry_price': entry_price,
                 'current_price': entry_price,
-                'entry_time': datetime.now().isoformat(),
-                'last_update': datetime.now().isoformat(),
+                'entry_time': datetime.fromtimestamp(now).isoformat(),
+                'entry_ts': now,
+                'last_update': datetime.fromtimestamp(now).isoformat(),
                 'status': 'open',
                 'pnl': 0,
                 'roi': 0
@@ -76,7 +79,9 @@ class PositionManager:
             
             # Update position
             position['exit_price'] = exit_price
-            position['exit_time'] = datetime.now().isoformat()
+            now = time.time()
+            position['exit_time'] = datetime.fromtimestamp(now).isoformat()
+            position['exit_ts'] = now
             position['final_pnl'] = final_pnl
             position['status'] = 'closed'
             
@@ -215,15 +220,17 @@ class PositionManager:
             
             # Filter by time range
             if start_time:
+                start_ts = start_time.timestamp()
                 history = [pos for pos in history 
-                          if datetime.fromisoformat(pos['entry_time']) >= start_time]
+                          if pos['entry_ts'] >= start_ts]
             
             if end_time:
+                end_ts = end_time.timestamp()
                 history = [pos for pos in history 
-                          if datetime.fromisoformat(pos['exit_time']) <= end_time]
+                          if pos['exit_ts'] <= end_ts]
             
             return sorted(history, 
-                         key=lambda x: datetime.fromisoformat(x['entry_time']), 
+                         key=lambda x: x['entry_ts'], 
                          reverse=True)
         except Exception as e:
             self.logger.error(f"Error getting position history: {e}")
@@ -1,5 +1,6 @@
 // WebSocket connection
 let ws;
+const textDecoder = new TextDecoder();
 let botRunning = false;
 let settings = {
     trading: {
@@ -21,6 +22,7 @@ let settings = {
 // Initialize WebSocket connection
 function initWebSocket() {
     ws = new WebSocket(`ws://${window.location.host}/ws`);
+    ws.binaryType = 'arraybuffer';
     
     ws.onopen = () => {
         console.log('Connected to server');
@@ -28,7 +30,9 @@ function initWebSocket() {
     };
 
     ws.onmessage = (event) => {
-        const data = JSON.parse(event.data);
+        // Server frames are binary UTF-8 JSON
+        const text = typeof event.data === 'string' ? event.data : textDecoder.decode(event.data);
+        const data = JSON.parse(text);
         handleWebSocketMessage(data);
     };
 
@@ -46,7 +50,9 @@ function initWebSocket() {
 
 // Handle incoming WebSocket messages
 function handleWebSocketMessage(data) {
-    if (data.type === 'update') {
+    if (data.type === 'batch') {
+        data.data.forEach(handleWebSocketMessage);
+    } else if (data.type === 'update') {
         updateUI(data.data);
     } else if (data.type === 'log') {
         addLog(data.data.level, data.data.message);
@@ -126,11 +126,8 @@ class StrategyManager:
             if strategy_id not in self.strategy_signals:
                 return []
             
-            return sorted(
-                self.strategy_signals[strategy_id],
-                key=lambda x: datetime.fromisoformat(x['timestamp']),
-                reverse=True
-            )
+            # Signals are appended in time order, so newest first is a reversal
+            return self.strategy_signals[strategy_id][::-1]
         except Exception as e:
             self.logger.error(f"Error getting strategy signals: {e}")
             return []
@@ -1,18 +1,74 @@
 import os
 import json
 import asyncio
+import time
+import functools
+from collections import OrderedDict
+import orjson
+from aiohttp import ClientSession, TCPConnector
 from web3 import Web3, AsyncWeb3
-from web3.middleware import geth_poa_middleware
+from web3._utils.encoding import Web3JsonEncoder
 from eth_account import Account
+from eth_abi import encode, decode
 from dotenv import load_dotenv
 import logging
-from datetime import datetime
 from config import NETWORK
+from contracts import (
+    MULTICALL3_ADDRESS, MULTICALL3_ABI,
+    SYMBOL_SEL, NAME_SEL, DECIMALS_SEL, BALANCE_OF_SEL, ALLOWANCE_SEL
+)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _configure_logging():
+    """Configure root logging for standalone runs"""
+    logging.basicConfig(level=logging.INFO)
+
+FEE_REFRESH_INTERVAL = 12  # seconds, roughly one mainnet block
+PRICE_CACHE_BLOCKS = 4  # quotes are reused within a 4-block window
+PRICE_CACHE_SIZE = 1024
+
+# Canonical form for address-keyed caches
+_canon = str.lower
+
+SWAP_EXACT_TOKENS_FOR_TOKENS_ARGS = ['uint256', 'uint256', 'address[]', 'address', 'uint256']
+
+@functools.lru_cache(maxsize=4096)
+def _to_checksum_address(address):
+    """Checksum an address, memoized since each conversion runs keccak"""
+    return Web3.to_checksum_address(address)
+
+# Contract ABIs, parsed once at import
+ABI_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'abi')
+with open(os.path.join(ABI_DIR, 'erc20.json'), 'r') as f:
+    ERC20_ABI = json.load(f)
+with open(os.path.join(ABI_DIR, 'router.json'), 'r') as f:
+    ROUTER_ABI = json.load(f)
+
+def _decode_field(output_type, return_data):
+    """Decode one multicall result, or None when the token does not follow the ABI"""
+    try:
+        return decode([output_type], return_data)[0]
+    except Exception:
+        # e.g. MKR-style tokens return symbol/name as bytes32 rather than string
+        return None
+
+class OrjsonAsyncHTTPProvider(AsyncWeb3.AsyncHTTPProvider):
+    """AsyncHTTPProvider that encodes and decodes JSON-RPC payloads with orjson"""
+    _json_encoder = Web3JsonEncoder()
+
+    def encode_rpc_request(self, method, params):
+        rpc_dict = {
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params or [],
+            "id": next(self.request_counter),
+        }
+        return orjson.dumps(rpc_dict, default=self._json_encoder.default)
+
+    def decode_rpc_response(self, raw_response):
+        return orjson.loads(raw_response)
+
 class DexTrader:
     def __init__(self, chain='ethereum'):
         load_dotenv()
@@ -23,8 +79,11 @@ class DexTrader:
             raise ValueError("ETHEREUM_RPC_URL not found in environment variables")
         
         # Initialize Web3
-        self.w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(self.rpc_url))
-        self.w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+        self.w3 = AsyncWeb3(OrjsonAsyncHTTPProvider(self.rpc_url))
+        # Transactions are built and signed locally, so the default stack
+        # (gas strategy, ENS, attrdict, validation, gas estimate) is pure overhead.
+        # ETHEREUM_RPC_URL is mainnet, which needs no POA extraData handling.
+        self.w3.middleware_onion.clear()
         
         # Account setup
         private_key = os.getenv('PRIVATE_KEY')
@@ -36,6 +95,7 @@ class DexTrader:
         self.max_slippage = float(os.getenv('MAX_SLIPPAGE', '2'))  # 2% default
         self.gas_limit = int(os.getenv('GAS_LIMIT', '300000'))
         self.max_gas_price = int(os.getenv('MAX_GAS_PRICE', '150'))  # in Gwei
+        self._max_gas_wei = Web3.to_wei(self.max_gas_price, 'gwei')
         
         # Load network specific configurations
         self.network_config = NETWORK.get(chain.lower())
@@ -43,117 +103,324 @@ class DexTrader:
             raise ValueError(f"Network configuration not found for chain: {chain}")
         
         # Initialize contract interfaces
-        self.router_address = Web3.to_checksum_address(self.network_config['router'])
-        with open('abi/router.json', 'r') as f:
-            router_abi = json.load(f)
-        self.router = self.w3.eth.contract(address=self.router_address, abi=router_abi)
+        self.router_address = _to_checksum_address(self.network_config['router'])
+        self.weth = _to_checksum_address(self.network_config['weth'])
+        self.router = self.w3.eth.contract(address=self.router_address, abi=ROUTER_ABI)
+        self._token_factory = self.w3.eth.contract(abi=ERC20_ABI)
+        self._token_contracts = {}
+        self._buy_path_cache = {}
+        self._sell_path_cache = {}
+        self._price_cache = OrderedDict()  # (token, amount_in, block bucket) -> price
+        self._token_metadata = {}  # token -> symbol/name/decimals, which never change
+        self.multicall = self.w3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+        self._swap_exact_tokens_sel = Web3.keccak(
+            text=f"swapExactTokensForTokens({','.join(SWAP_EXACT_TOKENS_FOR_TOKENS_ARGS)})"
+        )[:4]
+        # Offset of the path array (five head words) followed by the recipient
+        self._swap_static_words = encode(['uint256', 'address'], [32 * 5, self.account.address])
+        self._swap_path_tails = {}
+        self._session = None
+        self.chain_id = None
+        self._swap_tx_template = None
+        self._fee_cache = None  # (block_number, base_fee, priority_fee)
+        self._fee_task = None
+        self._nonce = None
+        self._nonce_stale = False  # a send failed; resync once no nonce is in flight
+        self._nonces_in_flight = 0  # nonces handed out whose send has not finished
+        self._nonce_lock = asyncio.Lock()
         
-        logger.info(f"DexTrader initialized for {chain}")
+        logger.info("DexTrader initialized for %s", chain)
         
     async def initialize(self):
         """Initialize async components of the trader"""
-        chain_id = await self.w3.eth.chain_id
-        logger.info(f"Connected to network: Chain ID {chain_id}")
-        logger.info(f"Wallet address: {self.account.address}")
+        # Share one keep-alive connection pool across all RPC calls
+        self._session = ClientSession(
+            connector=TCPConnector(limit=100, keepalive_timeout=120, ttl_dns_cache=300)
+        )
+        await self.w3.provider.cache_async_session(self._session)
+        # Prime chain id, fees and nonce together so the first trade needs no setup RPCs
+        await asyncio.gather(
+            self._init_swap_tx_template(),
+            self._refresh_fees(),
+            self._sync_nonce()
+        )
+        self._fee_task = asyncio.create_task(self._fee_refresher())
+        logger.info("Connected to network: Chain ID %s", self.chain_id)
+        logger.info("Wallet address: %s", self.account.address)
         return self
 
     async def get_token_contract(self, token_address):
         """Get token contract instance"""
-        token_address = Web3.to_checksum_address(token_address)
-        with open('abi/erc20.json', 'r') as f:
-            token_abi = json.load(f)
-        return self.w3.eth.contract(address=token_address, abi=token_abi)
+        cache_key = _canon(token_address)
+        contract = self._token_contracts.get(cache_key)
+        if contract is None:
+            contract = self._token_factory(address=_to_checksum_address(token_address))
+            self._token_contracts[cache_key] = contract
+        return contract
+
+    async def close(self):
+        """Stop the fee refresher and close the shared RPC session"""
+        if self._fee_task:
+            self._fee_task.cancel()
+            self._fee_task = None
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _init_swap_tx_template(self):
+        """Build the static fields shared by every swap transaction"""
+        self.chain_id = await self.w3.eth.chain_id
+        self._swap_tx_template = {
+            'chainId': self.chain_id,
+            'to': self.router_address,
+            'gas': self.gas_limit,
+            'value': 0,
+        }
+        return self._swap_tx_template
+
+    async def _sync_nonce(self):
+        """Load the pending nonce from the node"""
+        async with self._nonce_lock:
+            self._nonce = await self.w3.eth.get_transaction_count(self.account.address, 'pending')
+            self._nonce_stale = False
+
+    async def _next_nonce(self):
+        """Hand out the next nonce, syncing from the node when unknown or stale and nothing is in flight"""
+        async with self._nonce_lock:
+            if self._nonce is None or (self._nonce_stale and not self._nonces_in_flight):
+                self._nonce = await self.w3.eth.get_transaction_count(self.account.address, 'pending')
+                self._nonce_stale = False
+            nonce = self._nonce
+            self._nonce += 1
+            self._nonces_in_flight += 1
+            return nonce
+
+    def _settle_nonce(self, sent):
+        """Mark a nonce from _next_nonce as broadcast, or as lost when its send failed"""
+        self._nonces_in_flight -= 1
+        if not sent:
+            # Other trades may hold later nonces, so resync only once they have settled
+            self._nonce_stale = True
+
+    async def _refresh_fees(self):
+        """Refresh the cached base and priority fee from a single eth_feeHistory call"""
+        history = await self.w3.eth.fee_history(1, 'latest', [50])
+        # The last base fee applies to the next block; the reward is its predecessor's median tip
+        priority_fee = history['reward'][0][0] or await self.w3.eth.max_priority_fee
+        self._fee_cache = (history['oldestBlock'] + 1, history['baseFeePerGas'][-1], priority_fee)
+
+    async def _fee_refresher(self):
+        """Keep the fee cache current in the background so trades skip the fee RPC"""
+        while True:
+            await asyncio.sleep(FEE_REFRESH_INTERVAL)
+            try:
+                await self._refresh_fees()
+            except Exception as e:
+                logger.error("Error refreshing fees: %s", e)
+
+    async def _get_fee_params(self):
+        """Get EIP-1559 fee fields from the refreshed fee cache"""
+        if self._fee_cache is None or self._fee_task is None:
+            await self._refresh_fees()
+        _, base_fee, priority_fee = self._fee_cache
+        max_fee = min(int(base_fee * 2) + priority_fee, self._max_gas_wei)
+        return {
+            'maxFeePerGas': max_fee,
+            'maxPriorityFeePerGas': min(priority_fee, max_fee),
+            'type': 2,
+        }
+
+    def _get_swap_path(self, token_address, is_buy):
+        """Get the cached WETH<->token swap path for a token"""
+        cache = self._buy_path_cache if is_buy else self._sell_path_cache
+        cache_key = _canon(token_address)
+        path = cache.get(cache_key)
+        if path is None:
+            token_address = _to_checksum_address(token_address)
+            path = (self.weth, token_address) if is_buy else (token_address, self.weth)
+            cache[cache_key] = path
+        return path
+
+    def _encode_swap_calldata(self, amount_in, min_amount_out, path, deadline):
+        """Encode swapExactTokensForTokens calldata, reusing the pre-encoded static words"""
+        tail = self._swap_path_tails.get(path)
+        if tail is None:
+            # Length-prefixed address array, without the leading offset word
+            tail = encode(['address[]'], [path])[32:]
+            self._swap_path_tails[path] = tail
+        return b''.join((
+            self._swap_exact_tokens_sel,
+            amount_in.to_bytes(32, 'big'),
+            min_amount_out.to_bytes(32, 'big'),
+            self._swap_static_words,
+            deadline.to_bytes(32, 'big'),
+            tail,
+        ))
+
+    def _calculate_min_tokens(self, amount_out, slippage=None):
+        """Calculate minimum output amount after slippage"""
+        if slippage is None:
+            slippage = self.max_slippage
+        # Integer basis-point math, since wei amounts exceed float precision
+        return amount_out * (10_000 - round(slippage * 100)) // 10_000
+
+    async def batch_token_reads(self, token_address):
+        """Read token metadata, balance and router allowance in a single Multicall3 eth_call"""
+        return (await self.batch_token_reads_many([token_address]))[token_address]
+
+    async def batch_token_reads_many(self, token_addresses):
+        """Read metadata, balance and router allowance for several tokens in one Multicall3 eth_call"""
+        metadata_reads = [
+            ('symbol', SYMBOL_SEL, 'string'),
+            ('name', NAME_SEL, 'string'),
+            ('decimals', DECIMALS_SEL, 'uint8'),
+        ]
+        state_reads = [
+            ('balance', BALANCE_OF_SEL + encode(['address'], [self.account.address]), 'uint256'),
+            ('allowance', ALLOWANCE_SEL + encode(
+                ['address', 'address'], [self.account.address, self.router_address]
+            ), 'uint256'),
+        ]
+        # Metadata is immutable, so only tokens not seen before read it
+        plan = [
+            (token_address, state_reads if _canon(token_address) in self._token_metadata
+             else metadata_reads + state_reads)
+            for token_address in token_addresses
+        ]
+        results = iter(await self.multicall.functions.aggregate3([
+            (_to_checksum_address(token_address), True, calldata)
+            for token_address, reads in plan
+            for _, calldata, _ in reads
+        ]).call())
+        
+        tokens = {}
+        for token_address, reads in plan:
+            key = _canon(token_address)
+            token_data = dict(self._token_metadata.get(key, ()))
+            for (field, _, output_type), (success, return_data) in zip(reads, results):
+                token_data[field] = _decode_field(output_type, return_data) if success and return_data else None
+            if key not in self._token_metadata and token_data['decimals'] is not None:
+                self._token_metadata[key] = {field: token_data[field] for field, _, _ in metadata_reads}
+            tokens[token_address] = token_data
+        return tokens
 
     async def get_token_balance(self, token_address):
         """Get token balance for the connected wallet"""
-        token_contract = await self.get_token_contract(token_address)
-        balance = await token_contract.functions.balanceOf(self.account.address).call()
-        return balance
+        result = await self.w3.eth.call({
+            'to': _to_checksum_address(token_address),
+            'data': BALANCE_OF_SEL + encode(['address'], [self.account.address])
+        })
+        return int.from_bytes(result, 'big')
 
     async def get_token_allowance(self, token_address, spender_address):
         """Get token allowance for a spender"""
-        token_contract = await self.get_token_contract(token_address)
-        allowance = await token_contract.functions.allowance(
-            self.account.address,
-            spender_address
-        ).call()
-        return allowance
+        result = await self.w3.eth.call({
+            'to': _to_checksum_address(token_address),
+            'data': ALLOWANCE_SEL + encode(['address', 'address'], [self.account.address, spender_address])
+        })
+        return int.from_bytes(result, 'big')
 
     async def approve_token(self, token_address, spender_address, amount):
         """Approve token spending"""
         token_contract = await self.get_token_contract(token_address)
+        fee_params = await self._get_fee_params()
         
         # Build the transaction
-        nonce = await self.w3.eth.get_transaction_count(self.account.address)
-        gas_price = await self.w3.eth.gas_price
-        
         txn = await token_contract.functions.approve(
             spender_address,
             amount
         ).build_transaction({
             'from': self.account.address,
             'gas': self.gas_limit,
-            'gasPrice': gas_price,
-            'nonce': nonce,
+            **fee_params,
         })
         
-        # Sign and send the transaction
-        signed_txn = self.w3.eth.account.sign_transaction(txn, self.account.key)
-        tx_hash = await self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        # Taken last, so a failed fee lookup or build never holds a nonce
+        txn['nonce'] = await self._next_nonce()
+        sent = False
+        try:
+            # Sign and send the transaction
+            signed_txn = self.w3.eth.account.sign_transaction(txn, self.account.key)
+            tx_hash = await self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            sent = True
+        finally:
+            self._settle_nonce(sent)
         return tx_hash
 
     async def get_price_data(self, token_address, amount_in=Web3.to_wei(1, 'ether')):
         """Get token price data"""
         try:
+            # Reuse the block the fee refresher last saw, so a cache hit costs no RPC
+            if self._fee_cache is None:
+                await self._refresh_fees()
+            block_number = self._fee_cache[0]
+            cache_key = (_canon(token_address), amount_in, block_number // PRICE_CACHE_BLOCKS)
+            price = self._price_cache.get(cache_key)
+            if price is not None:
+                self._price_cache.move_to_end(cache_key)
+                return price
+            
             # Use router to get amounts out
             amounts = await self.router.functions.getAmountsOut(
                 amount_in,
-                [token_address, self.network_config['weth']]
+                self._get_swap_path(token_address, is_buy=False)
             ).call()
-            return amounts[1] / amount_in
+            price = amounts[1] / amount_in
+            self._price_cache[cache_key] = price
+            if len(self._price_cache) > PRICE_CACHE_SIZE:
+                self._price_cache.popitem(last=False)
+            return price
         except Exception as e:
-            logger.error(f"Error getting price data: {str(e)}")
+            logger.error("Error getting price data: %s", e)
             return None
 
     async def execute_trade(self, token_address, amount, is_buy=True):
         """Execute a trade"""
         try:
-            path = [self.network_config['weth'], token_address] if is_buy else [token_address, self.network_config['weth']]
+            path = self._get_swap_path(token_address, is_buy)
             
-            # Get amounts out
-            amounts = await self.router.functions.getAmountsOut(amount, path).call()
-            min_amount_out = int(amounts[-1] * (1 - self.max_slippage / 100))
+            # Fetch the independent pre-trade reads concurrently
+            amounts, fee_params = await asyncio.gather(
+                self.router.functions.getAmountsOut(amount, path).call(),
+                self._get_fee_params()
+            )
+            min_amount_out = self._calculate_min_tokens(amounts[-1])
             
-            # Build the transaction
-            nonce = await self.w3.eth.get_transaction_count(self.account.address)
-            gas_price = await self.w3.eth.gas_price
+            deadline = int(time.time()) + 300  # 5 minutes
             
-            deadline = int(datetime.now().timestamp()) + 300  # 5 minutes
+            template = self._swap_tx_template or await self._init_swap_tx_template()
             
-            # Create the swap transaction
-            txn = await self.router.functions.swapExactTokensForTokens(
-                amount,
-                min_amount_out,
-                path,
-                self.account.address,
-                deadline
-            ).build_transaction({
-                'from': self.account.address,
-                'gas': self.gas_limit,
-                'gasPrice': gas_price,
-                'nonce': nonce,
-            })
+            # Create the swap transaction, filling only the per-trade fields
+            txn = {
+                **template,
+                'data': self._encode_swap_calldata(
+                    amount,
+                    min_amount_out,
+                    path,
+                    deadline
+                ),
+                **fee_params,
+            }
             
-            # Sign and send the transaction
-            signed_txn = self.w3.eth.account.sign_transaction(txn, self.account.key)
-            tx_hash = await self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            # Taken last, so a failed quote or build never holds a nonce
+            txn['nonce'] = await self._next_nonce()
+            sent = False
+            try:
+                # Sign and send the transaction
+                signed_txn = self.account.sign_transaction(txn)
+                tx_hash = await self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+                sent = True
+            finally:
+                self._settle_nonce(sent)
             return tx_hash
         except Exception as e:
-            logger.error(f"Error executing trade: {str(e)}")
+            logger.error("Error executing trade: %s", e)
             return None
 
 async def main():
     """Main entry point for testing the trading bot"""
+    _configure_logging()
+    trader = None
     try:
         trader = DexTrader()
         await trader.initialize()
@@ -161,8 +428,11 @@ async def main():
         # Add your test code here
         
     except Exception as e:
-        logger.error(f"Error in main: {str(e)}")
+        logger.error("Error in main: %s", e)
         raise
+    finally:
+        if trader:
+            await trader.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
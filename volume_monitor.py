@@ -1,17 +1,30 @@
 import asyncio
 import logging
-from datetime import datetime, timedelta
+import time
 from config import VOLUME_CONFIG
 import numpy as np
-from collections import defaultdict
+from collections import defaultdict, deque
+
+MAX_ALERTS = 10_000
+WASH_SIZE_TOLERANCE = 0.01  # trades within ~1% of each other count as the same size
+
+def _breakout_kernel(volumes, min_increase, periods):
+    """Check whether the last `periods` volumes all exceed the prior mean by `min_increase` %."""
+    if len(volumes) <= periods:
+        return False, 0.0
+    baseline = volumes[:-periods].mean()
+    if baseline <= 0:
+        return False, 0.0
+    increases = (volumes[-periods:] / baseline - 1) * 100
+    return bool((increases >= min_increase).all()), float(increases.min())
 
 class VolumeMonitor:
     def __init__(self, w3_provider):
         self.w3 = w3_provider
         self.logger = logging.getLogger(__name__)
-        self.volume_data = defaultdict(list)
+        self.volume_data = defaultdict(deque)  # pair -> deque of (epoch_ts, data)
         self.patterns = defaultdict(dict)
-        self.alerts = []
+        self.alerts = deque(maxlen=MAX_ALERTS)
         self.monitoring = False
 
     async def start_monitoring(self, pair_address):
@@ -23,8 +36,11 @@ class VolumeMonitor:
             self.monitoring = True
             
             while self.monitoring:
-                await self._update_volume_data(pair_address)
-                await self._analyze_patterns(pair_address)
+                # Analyze the current window while the next sample is in flight
+                await asyncio.gather(
+                    self._update_volume_data(pair_address),
+                    self._analyze_patterns(pair_address)
+                )
                 await asyncio.sleep(VOLUME_CONFIG['check_interval'])
         except Exception as e:
             self.logger.error(f"Error starting volume monitoring: {e}")
@@ -78,17 +94,14 @@ class VolumeMonitor:
             new_data = await self._fetch_latest_volume(pair_address)
             
             if new_data:
-                self.volume_data[pair_address].append({
-                    'timestamp': datetime.now().isoformat(),
-                    'data': new_data
-                })
+                now = time.time()
+                entries = self.volume_data[pair_address]
+                entries.append((now, new_data))
                 
-                # Keep only recent data (last 24 hours)
-                cutoff = datetime.now() - timedelta(hours=24)
-                self.volume_data[pair_address] = [
-                    entry for entry in self.volume_data[pair_address]
-                    if datetime.fromisoformat(entry['timestamp']) > cutoff
-                ]
+                # Keep only recent data (last 24 hours); entries are time-ordered
+                cutoff = now - 24 * 3600
+                while entries and entries[0][0] <= cutoff:
+                    entries.popleft()
         except Exception as e:
             self.logger.error(f"Error updating volume data: {e}")
 
@@ -151,14 +164,14 @@ class VolumeMonitor:
     def _calculate_volume_metrics(self, volume_data):
         """Calculate various volume metrics."""
         try:
-            if not volume_data:
+            if len(volume_data) == 0:
                 return {}
 
-            volumes = [entry['volume'] for entry in volume_data]
+            volumes = self._as_volume_array(volume_data)
             
             metrics = {
-                'average_volume': np.mean(volumes),
-                'volume_std': np.std(volumes),
+                'average_volume': volumes.mean(),
+                'volume_std': volumes.std(),
                 'volume_trend': self._calculate_volume_trend(volumes),
                 'volume_momentum': self._calculate_volume_momentum(volumes),
                 'relative_volume': self._calculate_relative_volume(volumes)
@@ -169,24 +182,57 @@ class VolumeMonitor:
             self.logger.error(f"Error calculating volume metrics: {e}")
             return {}
 
+    def _as_volume_array(self, volume_data):
+        """Extract the volume column as a float64 array."""
+        return np.fromiter(
+            (entry['volume'] for entry in volume_data),
+            dtype=np.float64,
+            count=len(volume_data)
+        )
+
+    def _calculate_volume_trend(self, volumes):
+        """Slope of a linear fit over the volume window."""
+        if len(volumes) < 2:
+            return 0.0
+        return np.polyfit(np.arange(len(volumes)), volumes, 1)[0]
+
+    def _calculate_volume_momentum(self, volumes, periods=10):
+        """Percent change of the latest volume against `periods` samples back."""
+        if len(volumes) < 2:
+            return 0.0
+        base = volumes[-min(periods, len(volumes))]
+        return (volumes[-1] - base) / base * 100 if base else 0.0
+
+    def _calculate_relative_volume(self, volumes):
+        """Latest volume relative to the window average."""
+        average = volumes.mean()
+        return volumes[-1] / average if average else 0.0
+
     def _assess_volume_quality(self, volume_data):
         """Assess the quality of trading volume."""
         try:
             if not volume_data:
                 return {'quality_score': 0, 'issues': ['No volume data available']}
 
-            quality_checks = {
-                'size_distribution': self._check_trade_size_distribution(volume_data),
-                'consistency': self._check_volume_consistency(volume_data),
-                'wash_trading': self._check_wash_trading(volume_data),
-                'manipulation': self._check_volume_manipulation(volume_data)
-            }
+            checks = (
+                ('size_distribution', self._check_trade_size_distribution),
+                ('consistency', self._check_volume_consistency),
+                ('wash_trading', self._check_wash_trading),
+                ('manipulation', self._check_volume_manipulation)
+            )
             
-            quality_score = sum(1 for check in quality_checks.values() if check['passed'])
-            quality_score = (quality_score / len(quality_checks)) * 100
+            # Run each check once, tallying passes and issues in the same pass
+            quality_checks = {}
+            passed = 0
+            issues = []
+            for name, check_fn in checks:
+                result = check_fn(volume_data)
+                quality_checks[name] = result
+                if result['passed']:
+                    passed += 1
+                issues.extend(result.get('issues', ()))
             
-            issues = [issue for check in quality_checks.values() 
-                     for issue in check.get('issues', [])]
+            quality_score = (passed / len(checks)) * 100
             
             return {
                 'quality_score': quality_score,
@@ -204,13 +250,14 @@ class VolumeMonitor:
                 return []
 
             signals = []
+            ts = time.time()
             
             # Check for volume breakout
             if self._detect_volume_breakout(volume_data):
                 signals.append({
                     'type': 'breakout',
                     'strength': self._calculate_breakout_strength(volume_data),
-                    'timestamp': datetime.now().isoformat()
+                    'ts': ts
                 })
             
             # Check for accumulation
@@ -218,7 +265,7 @@ class VolumeMonitor:
                 signals.append({
                     'type': 'accumulation',
                     'strength': self._calculate_accumulation_strength(volume_data),
-                    'timestamp': datetime.now().isoformat()
+                    'ts': ts
                 })
             
             # Check for distribution
@@ -226,7 +273,7 @@ class VolumeMonitor:
                 signals.append({
                     'type': 'distribution',
                     'strength': self._calculate_distribution_strength(volume_data),
-                    'timestamp': datetime.now().isoformat()
+                    'ts': ts
                 })
             
             return signals
@@ -237,12 +284,12 @@ class VolumeMonitor:
     async def _generate_pattern_alerts(self, pair_address, patterns):
         """Generate alerts for detected patterns."""
         try:
-            current_time = datetime.now()
+            ts = time.time()
             
             for pattern_type, pattern_data in patterns.items():
                 if pattern_data.get('detected'):
                     alert = {
-                        'timestamp': current_time.isoformat(),
+                        'ts': ts,
                         'pair_address': pair_address,
                         'pattern_type': pattern_type,
                         'strength': pattern_data.get('strength', 0),
@@ -260,11 +307,10 @@ class VolumeMonitor:
     def _clean_old_alerts(self):
         """Clean up old alerts."""
         try:
-            cutoff = datetime.now() - timedelta(hours=24)
-            self.alerts = [
-                alert for alert in self.alerts
-                if datetime.fromisoformat(alert['timestamp']) > cutoff
-            ]
+            # Alerts are appended in time order, so only the head can be stale
+            cutoff = time.time() - 24 * 3600
+            while self.alerts and self.alerts[0]['ts'] <= cutoff:
+                self.alerts.popleft()
         except Exception as e:
             self.logger.error(f"Error cleaning old alerts: {e}")
 
@@ -278,10 +324,56 @@ class VolumeMonitor:
         # Implement latest volume fetching
         pass
 
+    def _check_wash_trading(self, volume_data):
+        """Flag round trips: A->B trades matched by a same-size B->A trade in the window."""
+        try:
+            count = len(volume_data)
+            if count < 2:
+                return {'passed': True, 'issues': []}
+
+            # Low 64 bits of each address, plus a log-scale size bucket so near-equal sizes collide
+            senders = np.fromiter((int(entry['from'][-16:], 16) for entry in volume_data), dtype=np.uint64, count=count)
+            receivers = np.fromiter((int(entry['to'][-16:], 16) for entry in volume_data), dtype=np.uint64, count=count)
+            sizes = self._as_volume_array(volume_data)
+            size_buckets = np.round(
+                np.log(np.maximum(sizes, 1.0)) / np.log1p(WASH_SIZE_TOLERANCE)
+            ).astype(np.uint64)
+            
+            # Directed keys: a trade is one leg of a round trip if its reverse key also occurs
+            bucket_mix = size_buckets * np.uint64(0xC2B2AE3D27D4EB4F)
+            forward = senders ^ (receivers * np.uint64(0x9E3779B97F4A7C15)) ^ bucket_mix
+            reverse = receivers ^ (senders * np.uint64(0x9E3779B97F4A7C15)) ^ bucket_mix
+            matched = np.isin(reverse, forward) & (senders != receivers)
+            
+            wash_share = matched.sum() / count
+            issues = []
+            if matched.any():
+                round_trips = np.unique((forward ^ reverse)[matched]).size
+                issues.append(
+                    f"Possible wash trading: {round_trips} counterparty pairs trading the same size "
+                    f"back and forth, covering {wash_share:.0%} of trades"
+                )
+            return {'passed': not issues, 'wash_share': float(wash_share), 'issues': issues}
+        except Exception as e:
+            self.logger.error(f"Error checking wash trading: {e}")
+            return {'passed': False, 'issues': [str(e)]}
+
     def _check_breakout_pattern(self, volume_data, min_increase, confirmation_periods):
         """Check for volume breakout pattern."""
-        # Implement breakout pattern detection
-        pass
+        try:
+            detected, strength = _breakout_kernel(
+                self._as_volume_array(volume_data),
+                min_increase,
+                confirmation_periods
+            )
+            return {
+                'detected': detected,
+                'strength': strength,
+                'details': {'min_increase': min_increase, 'periods': confirmation_periods}
+            }
+        except Exception as e:
+            self.logger.error(f"Error checking breakout pattern: {e}")
+            return {'detected': False, 'strength': 0}
 
     def _check_accumulation_pattern(self, volume_data, min_periods, max_variance):
         """Check for volume accumulation pattern."""
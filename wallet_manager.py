@@ -1,20 +1,67 @@
 from web3 import Web3
+from web3.exceptions import Web3Exception
 import logging
 from datetime import datetime, timedelta
 import asyncio
+import aiohttp
+import functools
+import itertools
+import time
 from eth_account import Account
 from eth_account.signers.local import LocalAccount
 from config import WALLET_CONFIG
+from contracts import MULTICALL3_ADDRESS, MULTICALL3_ABI, BALANCE_OF_SEL, DECIMALS_SEL
+from eth_abi import encode, decode
 import json
+import orjson
+import os
+from collections import defaultdict, deque
+
+@functools.lru_cache(maxsize=None)
+def _load_erc20_abi():
+    """Load the configured ERC20 ABI on first use rather than at import."""
+    # A relative path is taken from this module's directory, not the working directory
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), WALLET_CONFIG['erc20_abi_path'])
+    with open(path, 'r') as f:
+        return json.load(f)
+
+# Failures an RPC round-trip can raise; anything else is a bug and should propagate
+_RPC_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, ValueError, Web3Exception)
+
+# Typical gas used by common calls; scaled by gas_limit_multiplier instead of running eth_estimateGas
+_GAS_TABLE = {
+    'approve': 60_000,
+    'transfer': 65_000,
+    'swapExactETHForTokens': 160_000,
+    'swapExactTokensForETH': 180_000,
+    'swapExactTokensForTokens': 180_000,
+}
 
 class WalletManager:
     def __init__(self, w3_provider):
         self.w3 = w3_provider
         self.logger = logging.getLogger(__name__)
         self.wallets = {}
-        self.transactions = {}
-        self.nonce_tracker = {}
+        self.transactions = defaultdict(deque)  # address -> time-ordered tx records
+        self.tx_by_hash = {}  # hash -> the same tx record
+        self.nonce_tracker = {}  # address -> next nonce to hand out
+        self.nonce_counters = {}
+        self._nonce_locks = defaultdict(asyncio.Lock)
+        self._unsent = {}  # signed tx hash -> (address, nonce) until its send finishes
+        self._unsent_counts = defaultdict(int)  # address -> nonces handed out but not yet sent
+        self._stale_nonces = set()  # addresses to reseed once none of their nonces are unsent
         self.gas_prices = {}
+        self.multicall = self.w3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+        self._decimals_cache = {}
+        self._token_contracts = {}
+        self._gas_cache = {'block': None, 'base_fee': 0, 'priority_fee': 0, 'expires_at': 0}
+        self._session = None
+
+    async def close(self):
+        """Close the HTTP session used for batched RPC requests."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     async def add_wallet(self, private_key: str, label: str = None):
         """Add a new wallet to manage."""
@@ -22,11 +69,12 @@ class WalletManager:
             account: LocalAccount = Account.from_key(private_key)
             address = account.address
             
+            # The nonce counter is seeded on first use, so re-adding a wallet never resets it
             self.wallets[address] = {
                 'account': account,
                 'label': label or address[:10],
                 'balance': await self._get_balance(address),
-                'nonce': await self._get_nonce(address),
+                'nonce': self.nonce_tracker.get(address),
                 'added_at': datetime.now().isoformat()
             }
             
@@ -47,7 +95,7 @@ class WalletManager:
                 'address': address,
                 'label': wallet['label'],
                 'balance': await self._get_balance(address),
-                'nonce': await self._get_nonce(address),
+                'nonce': self.nonce_tracker.get(address),
                 'transaction_count': len(self.transactions.get(address, [])),
                 'added_at': wallet['added_at']
             }
@@ -59,38 +107,55 @@ class WalletManager:
 
     async def check_token_balance(self, wallet_address: str, token_address: str):
         """Check token balance for a wallet."""
+        balances = await self.check_token_balances(wallet_address, [token_address])
+        return balances.get(token_address, 0)
+
+    async def check_token_balances(self, wallet_address: str, token_addresses: list):
+        """Check balances of several tokens for a wallet in one Multicall3 call."""
         try:
-            # Get token contract
-            token_contract = self.w3.eth.contract(
-                address=token_address,
-                abi=self._get_erc20_abi()
-            )
+            balance_call = BALANCE_OF_SEL + encode(['address'], [wallet_address])
+            
+            # Decimals never change, so only ask for the ones not cached yet
+            needs_decimals = [token not in self._decimals_cache for token in token_addresses]
+            calls = []
+            for token, needs in zip(token_addresses, needs_decimals):
+                calls.append((token, True, balance_call))
+                if needs:
+                    calls.append((token, True, DECIMALS_SEL))
             
-            # Get balance
-            balance = await token_contract.functions.balanceOf(wallet_address).call()
-            decimals = await token_contract.functions.decimals().call()
+            results = iter(await self.multicall.functions.aggregate3(calls).call())
             
-            return balance / (10 ** decimals)
+            balances = {}
+            for token, needs in zip(token_addresses, needs_decimals):
+                success, data = next(results)
+                balance = decode(['uint256'], data)[0] if success and data else 0
+                if needs:
+                    success, data = next(results)
+                    if success and data:
+                        self._decimals_cache[token] = decode(['uint8'], data)[0]
+                
+                decimals = self._decimals_cache.get(token)
+                balances[token] = balance / (10 ** decimals) if decimals is not None else 0
+            
+            return balances
         except Exception as e:
-            self.logger.error(f"Error checking token balance: {e}")
-            return 0
+            self.logger.error(f"Error checking token balances: {e}")
+            return {}
 
     async def prepare_transaction(self, from_address: str, to_address: str, 
-                                value: int, data: bytes = None):
-        """Prepare a transaction for signing."""
+                                value: int, data: bytes = None, method_sig: str = None):
+        """Prepare a transaction for signing; a known method_sig skips gas estimation."""
         try:
             if from_address not in self.wallets:
                 raise ValueError("Wallet not found")
             
-            nonce = await self._get_nonce(from_address)
             gas_price = await self._get_optimal_gas_price()
             
-            # Estimate gas
+            # Estimate gas; the nonce is only allocated when the transaction is signed
             tx_params = {
                 'from': from_address,
                 'to': to_address,
                 'value': value,
-                'nonce': nonce,
                 'gasPrice': gas_price
             }
             
@@ -98,7 +163,7 @@ class WalletManager:
                 tx_params['data'] = data
             
             # Estimate gas limit
-            gas_limit = await self._estimate_gas(tx_params)
+            gas_limit = await self._estimate_gas(tx_params, method_sig)
             tx_params['gas'] = gas_limit
             
             return tx_params
@@ -107,67 +172,151 @@ class WalletManager:
             return None
 
     async def sign_transaction(self, tx_params: dict, wallet_address: str):
-        """Sign a prepared transaction."""
+        """Sign a prepared transaction, allocating its nonce if it has none yet."""
+        nonce = None
         try:
             if wallet_address not in self.wallets:
                 raise ValueError("Wallet not found")
             
             wallet = self.wallets[wallet_address]
+            if 'nonce' not in tx_params:
+                # Taken as the last step, so a failed preparation never burns a nonce
+                nonce = await self._get_nonce(wallet_address)
+                tx_params = {**tx_params, 'nonce': nonce}
             signed_tx = wallet['account'].sign_transaction(tx_params)
+            if nonce is not None:
+                self._unsent[signed_tx.hash] = (wallet_address, nonce)
             
             return signed_tx
         except Exception as e:
             self.logger.error(f"Error signing transaction: {e}")
+            if nonce is not None:
+                self.release_nonce(wallet_address, nonce)
             return None
 
-    async def send_transaction(self, signed_tx):
-        """Send a signed transaction."""
+    async def sign_transactions(self, txs: list, wallet_address: str):
+        """Sign several prepared transactions with increasing nonces, all or none."""
+        nonces = []
         try:
-            tx_hash = await self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-            
-            # Track transaction
-            tx_data = {
-                'hash': tx_hash.hex(),
-                'timestamp': datetime.now().isoformat(),
-                'status': 'pending'
-            }
-            
-            from_address = self.w3.eth.get_transaction(tx_hash)['from']
-            if from_address not in self.transactions:
-                self.transactions[from_address] = []
+            if wallet_address not in self.wallets:
+                raise ValueError("Wallet not found")
             
-            self.transactions[from_address].append(tx_data)
+            account = self.wallets[wallet_address]['account']
+            signed_txs = []
+            for tx_params in txs:
+                nonce = await self._get_nonce(wallet_address)
+                nonces.append(nonce)
+                signed_txs.append(account.sign_transaction({**tx_params, 'nonce': nonce}))
             
-            return tx_hash.hex()
+            for signed_tx, nonce in zip(signed_txs, nonces):
+                self._unsent[signed_tx.hash] = (wallet_address, nonce)
+            return signed_txs
         except Exception as e:
+            self.logger.error(f"Error signing transactions: {e}")
+            # Newest first, so each release can step the counter back
+            for nonce in reversed(nonces):
+                self.release_nonce(wallet_address, nonce)
+            return None
+
+    async def send_transaction(self, signed_tx, from_address: str = None):
+        """Send a signed transaction, recording it under the sender's address."""
+        if from_address is None:
+            from_address = Account.recover_transaction(signed_tx.rawTransaction)
+        try:
+            tx_hash = await self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        except _RPC_ERRORS as e:
             self.logger.error(f"Error sending transaction: {e}")
+            # The nonce may not have been consumed
+            self._settle_nonce(signed_tx, from_address, sent=False)
             return None
+        
+        self._settle_nonce(signed_tx, from_address, sent=True)
+        self._track_transaction(tx_hash.hex(), from_address)
+        return tx_hash.hex()
+
+    async def send_batch(self, signed_txs: list, from_address: str = None):
+        """Send several signed transactions in one JSON-RPC batch request, in order."""
+        if from_address is None:
+            from_address = Account.recover_transaction(signed_txs[0].rawTransaction)
+        try:
+            payload = [
+                {'jsonrpc': '2.0', 'id': i, 'method': 'eth_sendRawTransaction',
+                 'params': [tx.rawTransaction.hex()]}
+                for i, tx in enumerate(signed_txs)
+            ]
+            async with self._get_session().post(
+                self.w3.provider.endpoint_uri,
+                data=orjson.dumps(payload),
+                headers={'Content-Type': 'application/json'}
+            ) as response:
+                replies = orjson.loads(await response.read())
+            if not isinstance(replies, list):
+                raise ValueError(f"Batch request rejected: {replies}")
+            
+            # Replies may arrive in any order; match them back up by id
+            by_id = {reply.get('id'): reply for reply in replies}
+            tx_hashes = []
+            for i in range(len(signed_txs)):
+                reply = by_id.get(i, {})
+                tx_hash = reply.get('result')
+                if tx_hash:
+                    self._track_transaction(tx_hash, from_address)
+                else:
+                    self.logger.error(f"Error sending batched transaction {i}: {reply.get('error')}")
+                self._settle_nonce(signed_txs[i], from_address, sent=bool(tx_hash))
+                tx_hashes.append(tx_hash)
+            
+            return tx_hashes
+        except _RPC_ERRORS as e:
+            self.logger.error(f"Error sending transaction batch: {e}")
+            for signed_tx in signed_txs:
+                self._settle_nonce(signed_tx, from_address, sent=False)
+            return [None] * len(signed_txs)
+
+    def _track_transaction(self, tx_hash: str, from_address: str):
+        """Record a sent transaction under its sender and by hash."""
+        now = datetime.now()
+        tx_data = {
+            'hash': tx_hash,
+            'timestamp': now.isoformat(),
+            'ts': now.timestamp(),
+            'status': 'pending'
+        }
+        self.transactions[from_address].append(tx_data)
+        self.tx_by_hash[tx_hash] = tx_data
 
     async def monitor_transaction(self, tx_hash: str):
         """Monitor transaction status."""
         try:
             receipt = None
-            retries = 0
             max_retries = WALLET_CONFIG['transaction_monitor']['max_retries']
+            max_delay = WALLET_CONFIG['transaction_monitor']['retry_delay']
+            delay = min(0.2, max_delay)
+            # Poll for as long as max_retries fixed-delay polls used to take
+            timeout = max_retries * max_delay
+            deadline = time.monotonic() + timeout
             
-            while not receipt and retries < max_retries:
+            while not receipt:
                 try:
                     receipt = await self.w3.eth.get_transaction_receipt(tx_hash)
-                except:
-                    await asyncio.sleep(WALLET_CONFIG['transaction_monitor']['retry_delay'])
-                    retries += 1
+                except _RPC_ERRORS:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    # Back off 200/400/800ms... so fast inclusions are seen quickly
+                    await asyncio.sleep(min(delay, remaining))
+                    delay = min(delay * 2, max_delay)
             
             if receipt:
                 # Update transaction status
-                for address, txs in self.transactions.items():
-                    for tx in txs:
-                        if tx['hash'] == tx_hash:
-                            tx['status'] = 'confirmed' if receipt['status'] else 'failed'
-                            tx['receipt'] = receipt
+                tx = self.tx_by_hash.get(tx_hash)
+                if tx:
+                    tx['status'] = 'confirmed' if receipt['status'] else 'failed'
+                    tx['receipt'] = receipt
                 
                 return receipt
             else:
-                self.logger.warning(f"Transaction {tx_hash} not found after {max_retries} retries")
+                self.logger.warning(f"Transaction {tx_hash} not found after {timeout}s")
                 return None
         except Exception as e:
             self.logger.error(f"Error monitoring transaction: {e}")
@@ -176,37 +325,44 @@ class WalletManager:
     async def approve_token(self, token_address: str, spender_address: str, 
                           wallet_address: str, amount: int = None):
         """Approve token spending."""
+        try:
+            signed_tx = await self.sign_approval(token_address, spender_address, wallet_address, amount)
+            if not signed_tx:
+                return None
+            
+            tx_hash = await self.send_transaction(signed_tx, wallet_address)
+            return tx_hash
+        except Exception as e:
+            self.logger.error(f"Error approving token: {e}")
+            return None
+
+    async def sign_approval(self, token_address: str, spender_address: str, 
+                          wallet_address: str, amount: int = None):
+        """Build and sign a token approval without sending it."""
+        tx_data = await self.prepare_approval(token_address, spender_address, wallet_address, amount)
+        if not tx_data:
+            return None
+        return await self.sign_transaction(tx_data, wallet_address)
+
+    async def prepare_approval(self, token_address: str, spender_address: str, 
+                             wallet_address: str, amount: int = None):
+        """Build an unsigned token approval; its nonce is allocated at signing."""
         try:
             if wallet_address not in self.wallets:
                 raise ValueError("Wallet not found")
             
             # Get token contract
-            token_contract = self.w3.eth.contract(
-                address=token_address,
-                abi=self._get_erc20_abi()
-            )
+            token_contract = self._token_contract(token_address)
             
             # Prepare approval transaction
             if amount is None:
                 amount = 2**256 - 1  # Max uint256
             
-            tx_data = token_contract.functions.approve(
-                spender_address,
-                amount
-            ).build_transaction({
-                'from': wallet_address,
-                'nonce': await self._get_nonce(wallet_address)
-            })
-            
-            # Sign and send transaction
-            signed_tx = await self.sign_transaction(tx_data, wallet_address)
-            if not signed_tx:
-                return None
-            
-            tx_hash = await self.send_transaction(signed_tx)
-            return tx_hash
+            # Encode only the calldata and take the gas limit from the table
+            data = token_contract.encodeABI(fn_name='approve', args=[spender_address, amount])
+            return await self.prepare_transaction(wallet_address, token_address, 0, data, 'approve')
         except Exception as e:
-            self.logger.error(f"Error approving token: {e}")
+            self.logger.error(f"Error preparing approval: {e}")
             return None
 
     async def get_transaction_history(self, wallet_address: str, 
@@ -216,13 +372,11 @@ class WalletManager:
             if wallet_address not in self.transactions:
                 return []
             
-            txs = self.transactions[wallet_address]
+            txs = list(self.transactions[wallet_address])
             
             if start_time:
-                txs = [
-                    tx for tx in txs
-                    if datetime.fromisoformat(tx['timestamp']) >= start_time
-                ]
+                start_ts = start_time.timestamp()
+                txs = [tx for tx in txs if tx['ts'] >= start_ts]
             
             return txs
         except Exception as e:
@@ -232,13 +386,12 @@ class WalletManager:
     async def cleanup_old_data(self):
         """Clean up old transaction data."""
         try:
-            cutoff = datetime.now() - timedelta(days=WALLET_CONFIG['data_retention_days'])
+            cutoff = time.time() - timedelta(days=WALLET_CONFIG['data_retention_days']).total_seconds()
             
-            for address in self.transactions:
-                self.transactions[address] = [
-                    tx for tx in self.transactions[address]
-                    if datetime.fromisoformat(tx['timestamp']) > cutoff
-                ]
+            # Records are appended in time order, so only the head can be stale
+            for txs in self.transactions.values():
+                while txs and txs[0]['ts'] <= cutoff:
+                    self.tx_by_hash.pop(txs.popleft()['hash'], None)
         except Exception as e:
             self.logger.error(f"Error cleaning up old data: {e}")
 
@@ -247,48 +400,97 @@ class WalletManager:
         try:
             balance = await self.w3.eth.get_balance(address)
             return self.w3.from_wei(balance, 'ether')
-        except Exception as e:
+        except _RPC_ERRORS as e:
             self.logger.error(f"Error getting balance: {e}")
             return 0
 
-    async def _get_nonce(self, address: str):
-        """Get next nonce for address."""
-        try:
-            nonce = await self.w3.eth.get_transaction_count(address)
+    def _get_session(self):
+        """Get the keep-alive HTTP session for batched RPC requests, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=10, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._session
+
+    def release_nonce(self, address: str, nonce: int):
+        """Give back a nonce that was allocated but will never be sent."""
+        self._unsent_counts[address] -= 1
+        if self.nonce_tracker.get(address) == nonce + 1:
+            # Nothing was handed out after it, so the counter can just step back
+            self.nonce_counters[address] = itertools.count(nonce)
             self.nonce_tracker[address] = nonce
+        else:
+            # Later nonces are already out; reseed once they have all been sent
+            self._stale_nonces.add(address)
+
+    def _settle_nonce(self, signed_tx, address: str, sent: bool):
+        """Mark a signed transaction's nonce as broadcast, or as possibly unused when its send failed."""
+        entry = self._unsent.pop(signed_tx.hash, None)
+        if entry is not None:
+            self._unsent_counts[entry[0]] -= 1
+        if not sent:
+            self._stale_nonces.add(address)
+
+    async def _get_nonce(self, address: str):
+        """Get next nonce for address from the local counter.
+
+        The counter is seeded from the node's pending count on first use, and reseeded
+        after a failed send once no other nonce for the address is still unsent.
+        """
+        async with self._nonce_locks[address]:
+            if address not in self.nonce_counters or (
+                address in self._stale_nonces and not self._unsent_counts[address]
+            ):
+                nonce = await self.w3.eth.get_transaction_count(address, 'pending')
+                self.nonce_counters[address] = itertools.count(nonce)
+                self._stale_nonces.discard(address)
+            nonce = next(self.nonce_counters[address])
+            self.nonce_tracker[address] = nonce + 1
+            self._unsent_counts[address] += 1
             return nonce
-        except Exception as e:
-            self.logger.error(f"Error getting nonce: {e}")
-            return None
 
     async def _get_optimal_gas_price(self):
         """Get optimal gas price based on network conditions."""
         try:
-            base_fee = self.w3.eth.get_block('latest')['baseFeePerGas']
-            priority_fee = self.w3.eth.max_priority_fee
+            cache = self._gas_cache
             
-            gas_price = base_fee + priority_fee
-            self.gas_prices[datetime.now().isoformat()] = gas_price
+            # Base fee only moves once per block, so reuse it for a few seconds
+            if time.monotonic() >= cache['expires_at']:
+                block, priority_fee = await asyncio.gather(
+                    self.w3.eth.get_block('latest'),
+                    self.w3.eth.max_priority_fee
+                )
+                cache['block'] = block['number']
+                cache['base_fee'] = block['baseFeePerGas']
+                cache['priority_fee'] = priority_fee
+                cache['expires_at'] = time.monotonic() + 6.0
+                self.gas_prices[time.time()] = cache['base_fee'] + priority_fee
             
-            return gas_price
-        except Exception as e:
+            return cache['base_fee'] + cache['priority_fee']
+        except (*_RPC_ERRORS, KeyError) as e:  # KeyError: pre-London block without baseFeePerGas
             self.logger.error(f"Error getting optimal gas price: {e}")
             return None
 
-    async def _estimate_gas(self, tx_params: dict):
-        """Estimate gas for transaction."""
+    async def _estimate_gas(self, tx_params: dict, method_sig: str = None):
+        """Estimate gas for transaction, using the gas table for known methods."""
         try:
+            if method_sig in _GAS_TABLE:
+                return int(_GAS_TABLE[method_sig] * WALLET_CONFIG['gas_limit_multiplier'])
             gas_limit = await self.w3.eth.estimate_gas(tx_params)
             return int(gas_limit * WALLET_CONFIG['gas_limit_multiplier'])
-        except Exception as e:
+        except _RPC_ERRORS as e:
             self.logger.error(f"Error estimating gas: {e}")
             return None
 
     def _get_erc20_abi(self):
         """Get standard ERC20 ABI."""
-        try:
-            with open(WALLET_CONFIG['erc20_abi_path'], 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            self.logger.error(f"Error loading ERC20 ABI: {e}")
-            return None
+        return _load_erc20_abi()
+
+    def _token_contract(self, token_address: str):
+        """Get a token contract, constructing it once per address."""
+        contract = self._token_contracts.get(token_address)
+        if contract is None:
+            contract = self.w3.eth.contract(address=token_address, abi=self._get_erc20_abi())
+            self._token_contracts[token_address] = contract
+        return contract
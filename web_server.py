@@ -1,14 +1,18 @@
 from aiohttp import web
 import aiohttp
-import json
+import hashlib
+import orjson
 import asyncio
 from trader import DexTrader
 import logging
 import sys
+import signal
+import time
 import os
 from pathlib import Path
 from web3.eth import AsyncEth
 import traceback
+import weakref
 from datetime import datetime
 
 # Create logs directory if it doesn't exist
@@ -31,9 +35,34 @@ logging.root.addHandler(console_handler)
 
 logger = logging.getLogger(__name__)
 
+# Frames a client may have queued before it is treated as too slow and disconnected
+OUTBOX_SIZE = 512
+# Log level -> encoded log message envelope up to the message text
+_LOG_PREFIXES = {}
+
+# Bytes a websocket may buffer before sends wait for the socket to drain
+WS_WRITE_LIMIT = 2**20
+# Most queued messages merged into one websocket frame
+MAX_FRAME_BATCH = 64
+
+# orjson flags shared by every encode
+_ORJSON_OPTS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _orjson_default(obj):
+    """Encode values orjson has no native form for, e.g. HexBytes from web3"""
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.hex()
+    return str(obj)
+
+
+def _dumps(obj):
+    """Serialize a websocket message to JSON bytes"""
+    return orjson.dumps(obj, default=_orjson_default, option=_ORJSON_OPTS)
+
 # Log startup information
 logger.info("="*50)
-logger.info(f"Bot starting at {datetime.now()}")
+logger.info("Bot starting at %s", datetime.now())
 logger.info("="*50)
 
 try:
@@ -42,13 +71,20 @@ try:
             self.base_path = Path(__file__).parent
             self.app = web.Application()
             self.trader = None
-            self.websockets = set()
+            self._address = None  # trader wallet address, fixed once the trader exists
+            self.websockets = weakref.WeakSet()
+            self.outboxes = weakref.WeakKeyDictionary()  # ws -> queue of encoded frames for its writer task
+            self._close_tasks = set()  # closes of dropped slow clients, held until they finish
             self.running = False
+            self.runner = None
+            self._stop_event = asyncio.Event()
             self.price_update_interval = 60
             self.event_polling_interval = 30
             self.enable_price_alerts = True
             self.enable_position_alerts = True
             self.enable_gas_alerts = True
+            self._index_bytes = None
+            self._index_etag = None
 
         async def initialize(self):
             """Initialize the trading bot server"""
@@ -56,6 +92,11 @@ try:
                 # Initialize trader
                 self.trader = DexTrader(chain='ethereum')
                 await self.trader.initialize()
+                self._address = self.trader.account.address
+
+                # Preload the dashboard page
+                self._index_bytes = (self.base_path / 'templates' / 'index.html').read_bytes()
+                self._index_etag = f'"{hashlib.blake2b(self._index_bytes, digest_size=8).hexdigest()}"'
 
                 # Setup routes
                 self.app.router.add_get('/', self.handle_index)
@@ -64,44 +105,78 @@ try:
 
                 return self
             except Exception as e:
-                logger.error(f"Error initializing server: {str(e)}")
+                logger.error("Error initializing server: %s", e)
                 raise
 
         async def handle_index(self, request):
             """Handle index page request"""
             try:
-                index_path = self.base_path / 'templates' / 'index.html'
-                with open(index_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                return web.Response(text=content, content_type='text/html')
+                headers = {'ETag': self._index_etag, 'Cache-Control': 'public, max-age=60'}
+                if request.headers.get('If-None-Match') == self._index_etag:
+                    return web.Response(status=304, headers=headers)
+                return web.Response(
+                    body=self._index_bytes,
+                    content_type='text/html',
+                    charset='utf-8',
+                    headers=headers
+                )
             except Exception as e:
-                logger.error(f"Error serving index page: {str(e)}")
+                logger.error("Error serving index page: %s", e)
                 return web.Response(text="Error loading page", status=500)
 
         async def handle_websocket(self, request):
             """Handle WebSocket connections"""
             ws = web.WebSocketResponse()
             await ws.prepare(request)
+            self._raise_write_limits(ws, request)
+            self.outboxes[ws] = asyncio.Queue(maxsize=OUTBOX_SIZE)
+            writer = asyncio.create_task(self._writer(ws))
             self.websockets.add(ws)
             
             try:
                 async for msg in ws:
-                    if msg.type == aiohttp.WSMsgType.TEXT:
+                    if msg.type in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
                         try:
-                            data = json.loads(msg.data)
+                            data = orjson.loads(msg.data)
                             # Handle different message types
-                            if data['type'] == 'get_status':
+                            msg_type = data.get('type')
+                            if msg_type == 'get_status':
                                 await self.send_status(ws)
-                            elif data['type'] == 'execute_trade':
+                            elif msg_type == 'execute_trade':
                                 await self.handle_trade(ws, data)
-                        except json.JSONDecodeError:
+                        except orjson.JSONDecodeError:
                             logger.error("Invalid JSON received")
                         except Exception as e:
-                            logger.error(f"Error handling message: {str(e)}")
+                            logger.error("Error handling message: %s", e)
             finally:
-                self.websockets.remove(ws)
+                writer.cancel()
+                self.websockets.discard(ws)
+                self.outboxes.pop(ws, None)
             return ws
 
+        def _raise_write_limits(self, ws, request):
+            """Let bursts of frames buffer up to WS_WRITE_LIMIT in the transport before writes wait for a drain"""
+            if request.transport is not None:
+                request.transport.set_write_buffer_limits(high=WS_WRITE_LIMIT)
+
+        async def _writer(self, ws):
+            """Write a client's queued frames in order, so slow clients never block senders"""
+            queue = self.outboxes[ws]
+            try:
+                while True:
+                    batch = [await queue.get()]
+                    # Coalesce whatever else is already queued into one frame
+                    while not queue.empty() and len(batch) < MAX_FRAME_BATCH:
+                        batch.append(queue.get_nowait())
+                    if len(batch) == 1:
+                        await ws.send_bytes(batch[0])
+                    else:
+                        # Frames are already JSON, so splice them into the batch envelope as-is
+                        await ws.send_bytes(b'{"type":"batch","data":[' + b','.join(batch) + b']}')
+            except (ConnectionResetError, RuntimeError) as e:
+                logger.debug("Dropping client after failed send: %s", e)
+                self.websockets.discard(ws)
+
         async def send_status(self, ws):
             """Send status update to client"""
             try:
@@ -110,39 +185,97 @@ try:
                 
                 status = {
                     'type': 'status',
-                    'wallet': self.trader.account.address,
+                    'wallet': self._address,
                     'network': 'Ethereum',
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': time.time_ns() // 1_000_000  # epoch ms
                 }
-                await ws.send_json(status)
+                self._send(ws, status)
             except Exception as e:
-                logger.error(f"Error sending status: {str(e)}")
+                logger.error("Error sending status: %s", e)
+
+        def _send(self, ws, message):
+            """Queue one message for a client as an orjson-encoded binary frame"""
+            self._enqueue(ws, _dumps(message))
+
+        def _enqueue(self, ws, payload):
+            """Hand an encoded frame to the client's writer, disconnecting clients that fall too far behind"""
+            queue = self.outboxes.get(ws)
+            if queue is None or ws.closed:
+                self.websockets.discard(ws)
+                return
+            try:
+                queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                logger.warning("Client outbox full, disconnecting slow client")
+                self.websockets.discard(ws)
+                task = asyncio.create_task(ws.close())
+                self._close_tasks.add(task)
+                task.add_done_callback(self._close_done)
+
+        def _close_done(self, task):
+            """Forget a finished slow-client close, logging it if it failed"""
+            self._close_tasks.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                logger.debug("Error closing slow client: %s", task.exception())
+
+        def _broadcast_bytes(self, payload):
+            """Queue an already encoded frame for every connected client"""
+            for ws in tuple(self.websockets):
+                self._enqueue(ws, payload)
+
+        async def send_log(self, level, message):
+            """Push a log line to all clients"""
+            if not self.websockets:
+                return
+            # Only the message text is encoded per call; the envelope up to it is cached per level
+            prefix = _LOG_PREFIXES.get(level)
+            if prefix is None:
+                prefix = b'{"type":"log","data":{"level":' + _dumps(level) + b',"message":'
+                _LOG_PREFIXES[level] = prefix
+            self._broadcast_bytes(prefix + _dumps(message) + b'}}')
 
         async def handle_trade(self, ws, data):
             """Handle trade execution request"""
             try:
                 if not self.trader:
-                    await ws.send_json({
+                    self._send(ws, {
                         'type': 'error',
                         'message': 'Trader not initialized'
                     })
                     return
 
+                token_address = data.get('token_address')
+                amount = int(data.get('amount') or 0)
+                if not token_address or amount <= 0:
+                    self._send(ws, {
+                        'type': 'error',
+                        'message': 'Missing required parameters'
+                    })
+                    return
+
+                is_buy = data.get('is_buy', True)
+
                 # Execute trade logic here
                 result = await self.trader.execute_trade(
-                    data['token_address'],
-                    int(data['amount']),
-                    data.get('is_buy', True)
+                    token_address,
+                    amount,
+                    is_buy
                 )
 
-                await ws.send_json({
+                tx_hash = result.hex() if result else None
+                self._send(ws, {
                     'type': 'trade_result',
                     'success': bool(result),
-                    'tx_hash': result if result else None
+                    'tx_hash': tx_hash
                 })
+                # Let every dashboard's log show the outcome
+                if tx_hash:
+                    await self.send_log('info', f"{'Buy' if is_buy else 'Sell'} sent: {tx_hash}")
+                else:
+                    await self.send_log('error', f"{'Buy' if is_buy else 'Sell'} failed")
             except Exception as e:
-                logger.error(f"Error executing trade: {str(e)}")
-                await ws.send_json({
+                logger.error("Error executing trade: %s", e)
+                self._send(ws, {
                     'type': 'error',
                     'message': str(e)
                 })
@@ -150,28 +283,60 @@ try:
         async def start(self):
             """Start the trading bot server"""
             try:
-                runner = web.AppRunner(self.app)
-                await runner.setup()
-                site = web.TCPSite(runner, 'localhost', 8081)
+                self.runner = web.AppRunner(self.app)
+                await self.runner.setup()
+                site = web.TCPSite(self.runner, 'localhost', 8081)
                 await site.start()
                 logger.info("Server started at http://localhost:8081")
             except Exception as e:
-                logger.error(f"Error starting server: {str(e)}")
+                logger.error("Error starting server: %s", e)
                 raise
 
+        def request_stop(self):
+            """Ask the server to shut down"""
+            self._stop_event.set()
+
+        async def wait_until_stopped(self):
+            """Block until a stop is requested, then release resources"""
+            try:
+                await self._stop_event.wait()
+            except asyncio.CancelledError:
+                pass
+            finally:
+                if self.runner:
+                    await self.runner.cleanup()
+                if self.trader:
+                    await self.trader.close()
+                logger.info("Server stopped")
+
     async def main():
         """Main entry point"""
         server = TradingBotServer()
         await server.initialize()
         await server.start()
         
-        # Keep the server running
-        while True:
-            await asyncio.sleep(3600)
+        # Keep the server running until SIGINT/SIGTERM
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, server.request_stop)
+            except NotImplementedError:
+                pass  # Not supported on Windows; Ctrl+C still cancels main
+        await server.wait_until_stopped()
+
+    def run():
+        """Run main on uvloop's event loop when it is installed (not available on Windows)"""
+        try:
+            import uvloop
+        except ImportError:
+            asyncio.run(main())
+            return
+        # uvloop.install() is deprecated from Python 3.12; uvloop.run sets up the loop directly
+        uvloop.run(main())
 
     if __name__ == '__main__':
-        asyncio.run(main())
+        run()
 except Exception as e:
-    logger.error(f"Critical error during startup: {str(e)}")
+    logger.error("Critical error during startup: %s", e)
     logger.error(traceback.format_exc())
     sys.exit(1)